@@ -12,6 +12,17 @@ class Settings:
     SERPER_API_KEY = os.getenv("SERPER_API_KEY", "")
     IBM_BASE_URL = "https://us-south.ml.cloud.ibm.com"
     
+    # Optional shared cache for multi-worker deployments (e.g. redis://localhost:6379/0)
+    REDIS_URL = os.getenv("REDIS_URL", "")
+    
+    # Standalone WebSocket server backend: "asyncio" (websockets.serve) or "sansio" (lower memory per client)
+    WEBSOCKET_BACKEND = os.getenv("WEBSOCKET_BACKEND", "asyncio")
+    # Worker processes for the standalone WebSocket server; >1 shares the port via SO_REUSEPORT
+    WEBSOCKET_WORKERS = int(os.getenv("WEBSOCKET_WORKERS", 1))
+    
+    # Opt-in: fetch market cap via ticker.info (an extra Yahoo request per symbol, off by default)
+    STOCK_META_REFRESH = os.getenv("STOCK_META_REFRESH", "false").lower() == "true"
+    
     # Database settings
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ai_trading.db")
     DB_HOST = os.getenv("DB_HOST", "localhost")
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import os
 
@@ -20,7 +21,14 @@ except Exception as e:
     print(f"⚠️  Database initialization failed: {e}")
     print("Continuing with file-based storage...")
 
-app = FastAPI(title="AI Trading Agent", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close shared client connections on shutdown"""
+    yield
+    from services.stock_service import close_shared_clients
+    await close_shared_clients()
+
+app = FastAPI(title="AI Trading Agent", version="1.0.0", lifespan=lifespan)
 
 # Enable CORS for frontend
 app.add_middleware(
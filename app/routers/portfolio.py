@@ -59,8 +59,9 @@ async def reset_portfolio():
         else:
             # File-based service
             import os
-            if os.path.exists(portfolio_service.portfolio_file):
-                os.remove(portfolio_service.portfolio_file)
+            for path in (portfolio_service.portfolio_file, portfolio_service.trades_file):
+                if os.path.exists(path):
+                    os.remove(path)
             portfolio_service.portfolio_data = portfolio_service._load_portfolio()
             return {"message": "Portfolio reset successfully"}
     except Exception as e:
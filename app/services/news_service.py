@@ -8,9 +8,24 @@ import logging
 import asyncio
 import time
 import json
+import re
 
 logger = logging.getLogger(__name__)
 
+# Ticker-shaped queries (e.g. "AAPL", "BRK.B") get company info lookups
+_SYMBOL_RE = re.compile(r'^[A-Za-z]{1,5}(\.[A-Za-z]{1,2})?$')
+
+# SERPER relative dates like "2 hours ago" or "an hour ago" ("a"/"an" = 1) -> timedelta keyword
+# (months approximated as 30 days)
+_RELATIVE_DATE_RE = re.compile(r'^(\d+|an?)\s+(minute|hour|day|week|month)')
+_RELATIVE_DATE_UNITS = {
+    'minute': ('minutes', 1),
+    'hour': ('hours', 1),
+    'day': ('days', 1),
+    'week': ('weeks', 1),
+    'month': ('days', 30)
+}
+
 class NewsService:
     def __init__(self):
         self.base_url = "https://google.serper.dev"
@@ -138,7 +153,8 @@ class NewsService:
             
             logger.info(f"🌐 SERPER search: '{query}'")
             
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            # requests is blocking - run it in a worker thread so the event loop keeps serving
+            response = await asyncio.to_thread(requests.post, url, headers=headers, json=payload, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -173,8 +189,8 @@ class NewsService:
             
             # Get company info if it looks like a stock symbol
             company_info = None
-            if query.upper().isalpha() and len(query) <= 5:
-                company_info = self._get_company_info(query)
+            if _SYMBOL_RE.match(query):
+                company_info = await asyncio.to_thread(self._get_company_info, query)
             
             # Generate targeted search queries
             search_queries = self._generate_search_queries(query, company_info)
@@ -221,28 +237,26 @@ class NewsService:
             
             # Convert to NewsItem objects
             news_items = []
+            now = datetime.now(timezone.utc)
             for article in unique_articles[:limit]:
-                if article.get('title') and article.get('link'):
+                title = article.get('title')
+                url = article.get('link')
+                if title and url:
                     try:
-                        # Handle SERPER date format
-                        date_str = article.get('date', '')
-                        published_at = datetime.now(timezone.utc)  # Default to now with timezone
-                        
-                        # Try to parse relative dates like "2 hours ago", "1 day ago"
-                        if 'hour' in date_str:
-                            hours = int(date_str.split()[0]) if date_str.split()[0].isdigit() else 1
-                            published_at = datetime.now(timezone.utc) - timedelta(hours=hours)
-                        elif 'day' in date_str:
-                            days = int(date_str.split()[0]) if date_str.split()[0].isdigit() else 1
-                            published_at = datetime.now(timezone.utc) - timedelta(days=days)
-                        elif 'week' in date_str:
-                            weeks = int(date_str.split()[0]) if date_str.split()[0].isdigit() else 1
-                            published_at = datetime.now(timezone.utc) - timedelta(weeks=weeks)
+                        # Parse SERPER relative dates like "2 hours ago", "1 day ago"
+                        published_at = now
+                        match = _RELATIVE_DATE_RE.match(article.get('date') or '')
+                        if match:
+                            unit, factor = _RELATIVE_DATE_UNITS[match.group(2)]
+                            amount = match.group(1)
+                            count = int(amount) if amount.isdigit() else 1
+                            published_at = now - timedelta(**{unit: count * factor})
                         
+                        description = article.get('snippet', '') or article.get('description', '')
                         news_item = NewsItem(
-                            title=article['title'][:200],
-                            description=(article.get('snippet', '') or article.get('description', ''))[:500],
-                            url=article['link'],
+                            title=title[:200],
+                            description=description[:500],
+                            url=url,
                             published_at=published_at,
                             source=article.get('source', 'Unknown')
                         )
@@ -1,63 +1,138 @@
 from typing import Dict, List, Optional
 from models import Portfolio, TradeAction
 from config import settings
-import json
+import numpy as np
+import orjson
 import os
+import time
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class Holding:
+    quantity: int
+    avg_price: float
+
 class PortfolioService:
     def __init__(self):
         self.portfolio_file = "portfolio.json"
+        self.trades_file = "trades.jsonl"  # append-only, one trade per line
         self.portfolio_data = self._load_portfolio()
     
+    def _index_holdings(self, holdings: Dict[str, Holding]):
+        """Rebuild the column arrays (symbols, quantities, avg prices) used for vectorized P&L"""
+        self._symbols = list(holdings)
+        self._qty = np.fromiter((h.quantity for h in holdings.values()), dtype=np.int64, count=len(holdings))
+        self._avg = np.fromiter((h.avg_price for h in holdings.values()), dtype=np.float64, count=len(holdings))
+    
     def _load_portfolio(self) -> Dict:
         """Load portfolio from file or create new one"""
         try:
             if os.path.exists(self.portfolio_file):
-                with open(self.portfolio_file, 'r') as f:
-                    return json.load(f)
+                with open(self.portfolio_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+                
+                # Move trades from older portfolio.json files into the trade log; trade_history is
+                # only dropped from portfolio.json once the log has been written safely
+                legacy_trades = data.get("trade_history")
+                if legacy_trades:
+                    try:
+                        self._migrate_legacy_trades(legacy_trades)
+                        del data["trade_history"]
+                        self._write_portfolio_file(data)
+                    except Exception as e:
+                        logger.error(f"Error migrating trade history, keeping it in {self.portfolio_file}: {e}")
+                
+                data["holdings"] = {
+                    symbol: Holding(**holding) for symbol, holding in data.get("holdings", {}).items()
+                }
+                self._index_holdings(data["holdings"])
+                return data
         except Exception as e:
             logger.error(f"Error loading portfolio: {e}")
         
         # Create new portfolio with initial budget
+        self._index_holdings({})
         return {
             "cash_balance": settings.INITIAL_BUDGET,
-            "holdings": {},  # symbol: {"quantity": int, "avg_price": float}
-            "trade_history": []
+            "holdings": {}  # symbol: Holding
         }
     
+    def _migrate_legacy_trades(self, legacy_trades: List[Dict]):
+        """Prepend legacy trades to the trade log via an fsynced temp file and atomic rename.
+
+        Skipped if the log already starts with them, i.e. an earlier run migrated them but
+        stopped before portfolio.json was rewritten.
+        """
+        legacy_lines = [orjson.dumps(trade) for trade in legacy_trades]
+        existing_lines = []
+        if os.path.exists(self.trades_file):
+            with open(self.trades_file, 'rb') as f:
+                existing_lines = [line for line in f.read().splitlines() if line.strip()]
+        
+        if existing_lines[:len(legacy_lines)] == legacy_lines:
+            return
+        
+        temp_file = self.trades_file + ".tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(b"".join(line + b"\n" for line in legacy_lines + existing_lines))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.trades_file)
+    
+    def _write_portfolio_file(self, data: Dict):
+        """Write cash balance and holdings as compact JSON, replacing the file atomically"""
+        temp_file = self.portfolio_file + ".tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(orjson.dumps(data))
+        os.replace(temp_file, self.portfolio_file)
+    
     def _save_portfolio(self):
         """Save portfolio to file"""
+        self._index_holdings(self.portfolio_data["holdings"])
         try:
-            with open(self.portfolio_file, 'w') as f:
-                json.dump(self.portfolio_data, f, indent=2)
+            self._write_portfolio_file(self.portfolio_data)
         except Exception as e:
             logger.error(f"Error saving portfolio: {e}")
     
+    def _append_trade(self, trade: Dict):
+        """Append a trade to the JSONL trade log"""
+        try:
+            with open(self.trades_file, 'ab') as f:
+                f.write(orjson.dumps(trade) + b"\n")
+        except Exception as e:
+            logger.error(f"Error recording trade: {e}")
+    
     async def get_portfolio(self, current_prices: Dict[str, float] = None) -> Portfolio:
         """Get current portfolio status"""
         if not current_prices:
             current_prices = {}
         
-        total_holdings_value = 0
-        holdings_list = []
+        prices = np.array(
+            [current_prices.get(symbol, self._avg[i]) for i, symbol in enumerate(self._symbols)],
+            dtype=np.float64
+        )
+        values = self._qty * prices
+        profit_loss = (prices - self._avg) * self._qty
+        total_holdings_value = float(values.sum())
         
-        for symbol, holding in self.portfolio_data["holdings"].items():
-            current_price = current_prices.get(symbol, holding["avg_price"])
-            value = holding["quantity"] * current_price
-            total_holdings_value += value
-            
-            holdings_list.append({
+        holdings_list = [
+            {
                 "symbol": symbol,
-                "quantity": holding["quantity"],
-                "avg_price": holding["avg_price"],
+                "quantity": quantity,
+                "avg_price": avg_price,
                 "current_price": current_price,
                 "value": value,
-                "profit_loss": (current_price - holding["avg_price"]) * holding["quantity"]
-            })
+                "profit_loss": pnl
+            }
+            for symbol, quantity, avg_price, current_price, value, pnl in zip(
+                self._symbols, self._qty.tolist(), self._avg.tolist(),
+                prices.tolist(), values.tolist(), profit_loss.tolist()
+            )
+        ]
         
         total_value = self.portfolio_data["cash_balance"] + total_holdings_value
         initial_value = settings.INITIAL_BUDGET
@@ -99,27 +174,20 @@ class PortfolioService:
         if symbol in self.portfolio_data["holdings"]:
             # Calculate new average price
             existing = self.portfolio_data["holdings"][symbol]
-            total_quantity = existing["quantity"] + quantity
-            total_cost_basis = (existing["quantity"] * existing["avg_price"]) + (quantity * price)
-            new_avg_price = total_cost_basis / total_quantity
-            
-            self.portfolio_data["holdings"][symbol] = {
-                "quantity": total_quantity,
-                "avg_price": new_avg_price
-            }
+            total_quantity = existing.quantity + quantity
+            total_cost_basis = (existing.quantity * existing.avg_price) + (quantity * price)
+            existing.avg_price = total_cost_basis / total_quantity
+            existing.quantity = total_quantity
         else:
-            self.portfolio_data["holdings"][symbol] = {
-                "quantity": quantity,
-                "avg_price": price
-            }
+            self.portfolio_data["holdings"][symbol] = Holding(quantity=quantity, avg_price=price)
         
         # Record trade
-        self.portfolio_data["trade_history"].append({
+        self._append_trade({
             "symbol": symbol,
             "action": "buy",
             "quantity": quantity,
             "price": price,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": time.time_ns()
         })
         
         self._save_portfolio()
@@ -132,7 +200,7 @@ class PortfolioService:
             return False
         
         holding = self.portfolio_data["holdings"][symbol]
-        if holding["quantity"] < quantity:
+        if holding.quantity < quantity:
             logger.warning(f"Insufficient shares to sell {quantity} of {symbol}")
             return False
         
@@ -141,22 +209,62 @@ class PortfolioService:
         self.portfolio_data["cash_balance"] += proceeds
         
         # Update holdings
-        holding["quantity"] -= quantity
-        if holding["quantity"] == 0:
+        holding.quantity -= quantity
+        if holding.quantity == 0:
             del self.portfolio_data["holdings"][symbol]
         
         # Record trade
-        self.portfolio_data["trade_history"].append({
+        self._append_trade({
             "symbol": symbol,
             "action": "sell",
             "quantity": quantity,
             "price": price,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": time.time_ns()
         })
         
         self._save_portfolio()
         return True
     
-    async def get_trade_history(self) -> List[Dict]:
-        """Get trading history"""
-        return self.portfolio_data.get("trade_history", [])
+    @staticmethod
+    def _format_timestamp(timestamp) -> str:
+        """Convert a stored epoch-ns timestamp to ISO-8601 (legacy entries are already strings)"""
+        if isinstance(timestamp, int):
+            return datetime.fromtimestamp(timestamp / 1e9, tz=timezone.utc).isoformat()
+        return timestamp
+    
+    def _read_last_trades(self, limit: int) -> List[Dict]:
+        """Read the last `limit` lines of the trade log without loading the whole file"""
+        if limit <= 0 or not os.path.exists(self.trades_file):
+            return []
+        
+        with open(self.trades_file, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            buffer = b""
+            # Read backwards in blocks until we have limit + 1 newlines (or hit the start)
+            while position > 0 and buffer.count(b"\n") <= limit:
+                block_size = min(8192, position)
+                position -= block_size
+                f.seek(position)
+                buffer = f.read(block_size) + buffer
+        
+        return [orjson.loads(line) for line in buffer.splitlines()[-limit:] if line.strip()]
+    
+    def _read_all_trades(self) -> List[Dict]:
+        """Read the whole trade log"""
+        if not os.path.exists(self.trades_file):
+            return []
+        with open(self.trades_file, 'rb') as f:
+            return [orjson.loads(line) for line in f if line.strip()]
+    
+    async def get_trade_history(self, limit: Optional[int] = None) -> List[Dict]:
+        """Get all trades, or only the most recent `limit`, oldest first"""
+        try:
+            trades = self._read_all_trades() if limit is None else self._read_last_trades(limit)
+        except Exception as e:
+            logger.error(f"Error reading trade history: {e}")
+            return []
+        
+        return [
+            {**trade, "timestamp": self._format_timestamp(trade.get("timestamp"))}
+            for trade in trades
+        ]
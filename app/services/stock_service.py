@@ -1,133 +1,575 @@
 import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError, YFTzMissingError
+import numpy as np
+import httpx
+from curl_cffi import requests as curl_requests
+from cachetools import TLRUCache, TTLCache
+from itertools import islice
 from typing import List, Dict, Optional
 from models import StockInfo
+from config import settings
 import logging
 import time
+import random
 import asyncio
+import functools
 import os
+import re
+import threading
 from datetime import datetime, timedelta
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
 logger = logging.getLogger(__name__)
 
+# Tickers like AAPL, BRK.B, BTC-USD
+_SYMBOL_RE = re.compile(r"^[A-Z0-9.\-]{1,10}$")
+
+# Yahoo's spark endpoint returns last/previous close for many symbols in one request
+SPARK_URL = "https://query1.finance.yahoo.com/v8/finance/spark"
+SPARK_BATCH_SIZE = 20
+SPARK_MAX_CONCURRENCY = 4
+# One pooled session shared by every StockService so yfinance reuses TCP/TLS connections.
+# yfinance only accepts curl_cffi sessions, hence no requests.Session here.
+YAHOO_SESSION = curl_requests.Session(impersonate="chrome")
+
+# Yahoo request budget: 30/min sustained, up to 5 back-to-back after a quiet period
+RATE_LIMIT_PER_SECOND = 0.5
+RATE_LIMIT_BURST = 5
+
+# Retry budget for single-ticker fetches (seconds)
+MAX_RETRIES = 3
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+
+# Circuit breaker: open after 5 failures within 60s, probe again after 30s
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_FAILURE_WINDOW = 60.0
+CIRCUIT_OPEN_SECONDS = 30.0
+# One breaker for the process (Yahoo health isn't per instance - several callers build a
+# StockService per request); _CIRCUIT_LOCK guards every read-modify-write of it
+YAHOO_CIRCUIT = {'fail_count': 0, 'state': 'closed', 'opened_at': 0.0, 'window_start': 0.0}
+_CIRCUIT_LOCK = threading.Lock()
+
+# Quote cache bound; least recently used entries are evicted first when full
+CACHE_MAXSIZE = 1024
+
+# Market cap barely moves intraday; refresh it from ticker.info at most hourly, off the hot path.
+# Shared by every StockService so per-request instances don't refetch it.
+META_CACHE_TTL = 3600
+META_CACHE = TTLCache(maxsize=CACHE_MAXSIZE, ttl=META_CACHE_TTL)
+_META_TASKS: Dict[str, asyncio.Task] = {}
+
+# Meta refreshes get their own small budget and are skipped (not queued) when it's empty,
+# so they never wait in front of quote fetches or spend the quote token bucket
+META_REFRESH_PER_SECOND = 0.1
+META_REFRESH_BURST = 2
+_meta_budget = {'tokens': float(META_REFRESH_BURST), 'last_refill': time.time()}
+
+# Symbols Yahoo reports as missing (delisted/no timezone/no prices) are remembered for an hour;
+# an unexplained empty result only for a few seconds, since it may be a transient failure
+NEGATIVE_CACHE_TTL = 3600
+EMPTY_RESULT_TTL = 30
+
+# Optional Redis cache shared by all workers; the in-process cache becomes a short-lived L1 in front of it.
+# The client binds to the event loop it's used on, so it's created on first use (see _get_redis)
+REDIS_ENABLED = bool(aioredis and settings.REDIS_URL)
+L1_CACHE_TTL = 30
+_redis_client = None
+
+# One HTTP client (and connection pool) for spark batch quotes, shared like YAHOO_SESSION
+HTTP_TIMEOUT = 10.0
+HTTP_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Upper bound on concurrent single-ticker fetches
+SINGLE_FETCH_CONCURRENCY = 4
+
 class StockDataException(Exception):
     """Custom exception for stock data retrieval errors"""
     pass
 
+def _validate_symbol(symbol: str) -> str:
+    """Validate and clean symbol format"""
+    # Type check before the cached call - lru_cache would raise TypeError on unhashable input
+    if not symbol or not isinstance(symbol, str):
+        raise StockDataException("Invalid symbol provided")
+    return _normalize_symbol(symbol)
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_symbol(symbol: str) -> str:
+    """Clean and format-check a symbol string (memoized - the same tickers are validated constantly)"""
+    symbol = symbol.strip().upper()
+    if not _SYMBOL_RE.match(symbol):
+        raise StockDataException(f"Invalid symbol format: {symbol}")
+    
+    return symbol
+
+def _take_meta_token() -> bool:
+    """Take a meta refresh token if one is available right now; never waits"""
+    now = time.time()
+    _meta_budget['tokens'] = min(
+        META_REFRESH_BURST,
+        _meta_budget['tokens'] + (now - _meta_budget['last_refill']) * META_REFRESH_PER_SECOND
+    )
+    _meta_budget['last_refill'] = now
+    if _meta_budget['tokens'] < 1:
+        return False
+    _meta_budget['tokens'] -= 1
+    return True
+
+def _get_redis():
+    """Return the shared Redis client, creating it inside the running event loop on first use"""
+    global _redis_client
+    if REDIS_ENABLED and _redis_client is None:
+        _redis_client = aioredis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client used for batch quotes, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, headers={'User-Agent': HTTP_USER_AGENT})
+    return _http_client
+
+async def close_shared_clients():
+    """Close connections shared by every StockService; called on app shutdown"""
+    global _redis_client, _http_client
+    if _http_client is not None:
+        try:
+            await _http_client.aclose()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing HTTP client: {e}")
+        _http_client = None
+    if _redis_client is not None:
+        try:
+            await _redis_client.aclose()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing Redis client: {e}")
+        _redis_client = None
+
 class StockService:
     def __init__(self):
-        self.cache = {}
         self.cache_duration = 180  # 3 minutes cache (reduced from 5)
-        # Remove aggressive rate limiting for faster responses
+        # Expired entries are evicted on access, so len(self.cache) is the valid count
+        self.cache = TTLCache(
+            maxsize=CACHE_MAXSIZE,
+            ttl=L1_CACHE_TTL if REDIS_ENABLED else self.cache_duration
+        )
+        # Spark quotes carry no volume, so they're kept apart from the single-quote cache (and
+        # Redis) and only serve get_multiple_stocks
+        self.batch_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=self.cache_duration)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.meta_cache = META_CACHE
+        # Values are the entry's TTL in seconds
+        self.negative_cache = TLRUCache(maxsize=CACHE_MAXSIZE, ttu=lambda _symbol, ttl, now: now + ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Pace outbound Yahoo requests only - cache hits never wait
+        self._tokens = float(RATE_LIMIT_BURST)
+        self._last_refill = time.time()
+        self._rate_limit_lock = asyncio.Lock()
+        self.session = YAHOO_SESSION
+        self._cb = YAHOO_CIRCUIT
         logger.info("StockService initialized with optimized caching")
         
-    def _is_cache_valid(self, symbol: str) -> bool:
-        """Check if cached data is still valid"""
-        if symbol not in self.cache:
+    async def _rate_limit_global(self):
+        """Token bucket for Yahoo requests: bursts after quiet periods, bounded long-run rate"""
+        async with self._rate_limit_lock:
+            now = time.time()
+            self._tokens = min(RATE_LIMIT_BURST, self._tokens + (now - self._last_refill) * RATE_LIMIT_PER_SECOND)
+            self._last_refill = now
+            
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / RATE_LIMIT_PER_SECOND)
+                self._last_refill = time.time()
+                self._tokens = 0.0
+            else:
+                self._tokens -= 1
+
+    def _cache_get(self, symbol: str, include_batch: bool = False) -> Optional[StockInfo]:
+        """Look up a cached quote, counting hits and misses for get_cache_status"""
+        cached = self.cache.get(symbol)
+        if cached is None and include_batch:
+            cached = self.batch_cache.get(symbol)
+        if cached is None:
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+        return cached
+
+    async def _redis_get_many(self, symbols: List[str]) -> Dict[str, StockInfo]:
+        """Look up quotes in the shared Redis cache, filling the local cache on hits"""
+        redis = _get_redis()
+        if not redis or not symbols:
+            return {}
+        found = {}
+        try:
+            values = await redis.mget([f"stock:{symbol}" for symbol in symbols])
+            for symbol, value in zip(symbols, values):
+                if value is not None:
+                    stock_info = StockInfo.model_validate_json(value)
+                    self.cache[symbol] = stock_info
+                    found[symbol] = stock_info
+        except Exception as e:
+            logger.warning(f"⚠️ Redis lookup failed: {e}")
+        return found
+
+    async def _redis_set(self, stock_info: StockInfo):
+        """Share a freshly fetched quote with other workers"""
+        redis = _get_redis()
+        if not redis:
+            return
+        try:
+            await redis.set(f"stock:{stock_info.symbol}", stock_info.model_dump_json(), ex=self.cache_duration)
+        except Exception as e:
+            logger.warning(f"⚠️ Redis write failed for {stock_info.symbol}: {e}")
+
+    def _with_meta(self, symbol: str, stock_info: StockInfo) -> StockInfo:
+        """Merge cached market cap into a quote, scheduling a background refresh when it's missing
+        (refreshes only run when STOCK_META_REFRESH is enabled)"""
+        if symbol not in self.meta_cache:
+            if not settings.STOCK_META_REFRESH:
+                return stock_info
+            # Low priority: only refresh while Yahoo is healthy and the meta budget has room;
+            # otherwise a later quote for the symbol will try again
+            if symbol not in _META_TASKS and self._cb['state'] == 'closed' and _take_meta_token():
+                _META_TASKS[symbol] = asyncio.create_task(self._refresh_meta(symbol))
+            return stock_info
+        
+        market_cap = self.meta_cache[symbol]
+        if market_cap is None:
+            return stock_info
+        return stock_info.model_copy(update={'market_cap': market_cap})
+
+    async def _refresh_meta(self, symbol: str):
+        """Fetch market cap via ticker.info (an extra quoteSummary request) without blocking callers"""
+        try:
+            ticker = yf.Ticker(symbol, session=self.session)
+            info = await asyncio.to_thread(getattr, ticker, 'info')
+            market_cap = info.get('marketCap') if isinstance(info, dict) else None
+            # Cache misses too (e.g. ETFs have no market cap) so we don't refetch on every quote
+            self.meta_cache[symbol] = float(market_cap) if market_cap else None
+        except Exception as e:
+            logger.warning(f"⚠️ Market cap refresh failed for {symbol}: {e}")
+        finally:
+            _META_TASKS.pop(symbol, None)
+
+    def _circuit_allows_request(self) -> bool:
+        """Check the Yahoo circuit breaker; lets a single probe through once the open period ends"""
+        with _CIRCUIT_LOCK:
+            state = self._cb['state']
+            if state == 'closed':
+                return True
+            if state == 'open' and time.time() - self._cb['opened_at'] >= CIRCUIT_OPEN_SECONDS:
+                self._cb['state'] = 'half_open'
+                logger.info("🔌 Yahoo circuit half-open - probing")
+                return True
             return False
-        return time.time() - self.cache[symbol]['timestamp'] < self.cache_duration
-    
-    def _validate_symbol(self, symbol: str) -> str:
-        """Validate and clean symbol format"""
-        if not symbol or not isinstance(symbol, str):
-            raise StockDataException("Invalid symbol provided")
+
+    def _record_success(self):
+        """Close the circuit after a successful Yahoo response"""
+        with _CIRCUIT_LOCK:
+            if self._cb['state'] != 'closed':
+                logger.info("✅ Yahoo circuit closed")
+            self._cb.update(fail_count=0, state='closed')
+
+    def _release_probe(self):
+        """Hand the half-open probe back when a request ends without an outcome (e.g. cancelled)"""
+        with _CIRCUIT_LOCK:
+            if self._cb['state'] == 'half_open':
+                # opened_at is unchanged, so the next request is allowed to probe straight away
+                self._cb['state'] = 'open'
+
+    def _record_failure(self):
+        """Count a Yahoo failure and open the circuit when failures pile up"""
+        with _CIRCUIT_LOCK:
+            now = time.time()
+            if self._cb['state'] == 'half_open':
+                self._cb.update(state='open', opened_at=now)
+                logger.warning("🔌 Yahoo probe failed - circuit re-opened")
+                return
+            
+            if now - self._cb['window_start'] > CIRCUIT_FAILURE_WINDOW:
+                self._cb.update(fail_count=0, window_start=now)
+            self._cb['fail_count'] += 1
+            if self._cb['fail_count'] >= CIRCUIT_FAILURE_THRESHOLD and self._cb['state'] == 'closed':
+                self._cb.update(state='open', opened_at=now)
+                logger.warning(f"🔌 Yahoo circuit opened after {self._cb['fail_count']} failures")
+
+    async def _fetch_spark_batch(self, symbols: List[str]) -> Dict[str, StockInfo]:
+        """Fetch quotes for up to SPARK_BATCH_SIZE symbols in a single spark request"""
+        await self._rate_limit_global()
+        response = await _get_http_client().get(
+            SPARK_URL,
+            params={'symbols': ','.join(symbols), 'range': '1d', 'interval': '1d'}
+        )
+        response.raise_for_status()
+        data = response.json()
         
-        symbol = symbol.strip().upper()
-        if not symbol.isalnum() and '.' not in symbol:
-            raise StockDataException(f"Invalid symbol format: {symbol}")
+        # Collect last/previous closes, then compute every change percent in one vectorized pass
+        priced_symbols, last_closes, previous_closes = [], [], []
+        for symbol in symbols:
+            entry = data.get(symbol) or {}
+            closes = [close for close in (entry.get('close') or []) if close is not None]
+            if not closes or closes[-1] <= 0:
+                continue
+            priced_symbols.append(symbol)
+            last_closes.append(closes[-1])
+            previous_closes.append(entry.get('previousClose') or entry.get('chartPreviousClose') or np.nan)
+        
+        if not priced_symbols:
+            return {}
         
-        return symbol
+        last = np.asarray(last_closes, dtype=np.float64)
+        previous = np.asarray(previous_closes, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_percent = np.where(previous > 0, (last - previous) / previous * 100.0, 0.0)
+        
+        results = {
+            symbol: StockInfo(
+                symbol=symbol,
+                current_price=price,
+                market_cap=None,
+                volume=None,
+                change_percent=change
+            )
+            for symbol, price, change in zip(
+                priced_symbols, np.round(last, 2).tolist(), np.round(change_percent, 2).tolist()
+            )
+        }
+        self.batch_cache.update(results)
+        return results
+
+    async def _fetch_spark(self, symbols: List[str]) -> Dict[str, StockInfo]:
+        """Fetch quotes for any number of symbols as concurrent spark batches"""
+        semaphore = asyncio.Semaphore(SPARK_MAX_CONCURRENCY)
+        remaining = iter(symbols)
+        chunks = list(iter(lambda: list(islice(remaining, SPARK_BATCH_SIZE)), []))
+        
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, StockInfo]:
+            async with semaphore:
+                if not self._circuit_allows_request():
+                    return {}
+                try:
+                    results = await self._fetch_spark_batch(chunk)
+                    self._record_success()
+                    return results
+                except Exception as e:
+                    self._record_failure()
+                    logger.warning(f"⚠️ Spark batch failed for {chunk}: {e}")
+                    return {}
+                except BaseException:
+                    self._release_probe()
+                    raise
+        
+        results = {}
+        for chunk_results in await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks]):
+            results.update(chunk_results)
+        return results
+
+    async def _fetch_many(self, symbols: List[str]) -> Dict[str, StockInfo]:
+        """Run get_stock_info for several symbols concurrently, bounded by a semaphore"""
+        semaphore = asyncio.Semaphore(SINGLE_FETCH_CONCURRENCY)
+        
+        async def fetch_single(symbol: str) -> Optional[StockInfo]:
+            async with semaphore:
+                return await self.get_stock_info(symbol)
+        
+        results = await asyncio.gather(
+            *[fetch_single(symbol) for symbol in symbols],
+            return_exceptions=True
+        )
+        
+        found = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to fetch {symbol}: {result}")
+            elif result:
+                found[symbol] = result
+        return found
 
     async def get_stock_info(self, symbol: str) -> Optional[StockInfo]:
         """Get current stock information with robust error handling and NO mock data"""
         try:
-            symbol = self._validate_symbol(symbol)
+            symbol = _validate_symbol(symbol)
         except StockDataException as e:
             logger.error(f"Symbol validation failed: {e}")
             return None
         
         # Check cache first - much faster!
-        if self._is_cache_valid(symbol):
+        cached = self._cache_get(symbol)
+        if cached is not None:
             logger.info(f"⚡ Cache hit for {symbol}")
-            return self.cache[symbol]['data']
+            return self._with_meta(symbol, cached)
+        if symbol in self.negative_cache:
+            logger.info(f"⚡ Negative cache hit for {symbol}")
+            return None
         
-        # Optimized single attempt with faster timeout
-        try:
-            logger.info(f"⚡ Fast fetch for {symbol}")
-            
-            # Create ticker and get data in one call
-            ticker = yf.Ticker(symbol)
-            
-            # Get recent data with shorter period for speed
-            hist = ticker.history(period="2d", interval="1d")
-            
-            if hist.empty or len(hist) == 0:
-                logger.warning(f"⚠️ No data for {symbol}")
-                return None
-            
-            # Extract data quickly
-            current_price = float(hist['Close'].iloc[-1])
-            volume = int(hist['Volume'].iloc[-1]) if len(hist['Volume']) > 0 else 0
-            
-            # Simple change calculation
-            change_percent = 0.0
-            if len(hist) >= 2:
-                previous_close = float(hist['Close'].iloc[-2])
-                change_percent = ((current_price - previous_close) / previous_close) * 100
-            
-            # Skip market cap for speed - can be fetched separately if needed
-            market_cap = None
-            
-            # Validate price
-            if current_price <= 0:
-                logger.warning(f"⚠️ Invalid price for {symbol}: {current_price}")
+        # Single-flight: concurrent misses for the same symbol share one upstream fetch
+        inflight = self._inflight.get(symbol)
+        if inflight is not None:
+            logger.info(f"⚡ Joining in-flight fetch for {symbol}")
+            stock_info = await asyncio.shield(inflight)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[symbol] = future
+            try:
+                stock_info = await self._load_stock_info(symbol)
+                future.set_result(stock_info)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # Waiters get the exception; mark it retrieved so an unawaited future doesn't warn
+                future.exception()
+                raise
+            finally:
+                self._inflight.pop(symbol, None)
+        
+        return self._with_meta(symbol, stock_info) if stock_info else None
+
+    async def _load_stock_info(self, symbol: str) -> Optional[StockInfo]:
+        """Resolve a local cache miss from Redis or Yahoo, retrying Yahoo with backoff"""
+        shared = (await self._redis_get_many([symbol])).get(symbol)
+        if shared is not None:
+            logger.info(f"⚡ Redis cache hit for {symbol}")
+            return shared
+        
+        for attempt in range(MAX_RETRIES):
+            # Short-circuit while Yahoo is failing instead of burning the retry budget
+            if not self._circuit_allows_request():
+                logger.warning(f"🔌 Yahoo circuit open - skipping fetch for {symbol}")
                 return None
             
-            stock_info = StockInfo(
-                symbol=symbol,
-                current_price=round(current_price, 2),
-                market_cap=market_cap,
-                volume=volume,
-                change_percent=round(change_percent, 2)
-            )
-            
-            # Cache the result for faster future requests
-            self.cache[symbol] = {
-                'data': stock_info,
-                'timestamp': time.time()
-            }
-            
-            logger.info(f"⚡ Fast data fetched for {symbol}: ${current_price:.2f} ({change_percent:+.2f}%)")
-            return stock_info
-            
-        except Exception as e:
-            logger.error(f"❌ Fast fetch failed for {symbol}: {e}")
-            return None
-        logger.error(f"Failed to fetch stock data for {symbol} after {max_retries} attempts")
+            try:
+                stock_info = await self._fetch_stock_info(symbol)
+                self._record_success()
+                return stock_info
+            except Exception as e:
+                self._record_failure()
+                if attempt == MAX_RETRIES - 1:
+                    logger.error(f"❌ Fast fetch failed for {symbol}: {e}")
+                    break
+                
+                # Jittered backoff spreads out retries when many symbols hit a 429 at once
+                if 'too many requests' in str(e).lower() or 'rate limit' in str(e).lower():
+                    wait_time = min(MAX_DELAY, BASE_DELAY * (2 ** attempt) + random.uniform(0, BASE_DELAY))
+                else:
+                    wait_time = random.uniform(0.5, 1.5)
+                logger.warning(f"⚠️ Fetch attempt {attempt + 1} failed for {symbol}: {e} - retrying in {wait_time:.1f}s")
+                await asyncio.sleep(wait_time)
+            except BaseException:
+                # Cancelled mid-fetch: no outcome to record, but don't keep the probe
+                self._release_probe()
+                raise
+        
+        logger.error(f"Failed to fetch stock data for {symbol} after {MAX_RETRIES} attempts")
         return None
 
+    async def _fetch_stock_info(self, symbol: str) -> Optional[StockInfo]:
+        """Fetch a single symbol from Yahoo; returns None when Yahoo has no usable data"""
+        await self._rate_limit_global()
+        logger.info(f"⚡ Fast fetch for {symbol}")
+        
+        # Create ticker and get data in one call
+        ticker = yf.Ticker(symbol, session=self.session)
+        
+        # Get recent data with shorter period for speed; yfinance blocks, so keep it off the event loop.
+        # raise_errors makes yfinance raise instead of returning an empty frame, so a missing ticker
+        # can be told apart from a network failure (which goes through retries and the breaker).
+        try:
+            hist = await asyncio.to_thread(ticker.history, period="2d", interval="1d", raise_errors=True)
+        except (YFTzMissingError, YFPricesMissingError) as e:
+            logger.warning(f"⚠️ Yahoo has no data for {symbol}: {e}")
+            self.negative_cache[symbol] = NEGATIVE_CACHE_TTL
+            return None
+        
+        if hist.empty or len(hist) == 0:
+            self.negative_cache[symbol] = EMPTY_RESULT_TTL
+            raise StockDataException(f"Empty price history for {symbol}")
+        
+        # Extract data quickly
+        current_price = float(hist['Close'].iloc[-1])
+        volume = int(hist['Volume'].iloc[-1]) if len(hist['Volume']) > 0 else 0
+        
+        # Simple change calculation
+        change_percent = 0.0
+        if len(hist) >= 2:
+            previous_close = float(hist['Close'].iloc[-2])
+            change_percent = ((current_price - previous_close) / previous_close) * 100
+        
+        # Market cap comes from meta_cache (see _with_meta) - ticker.info is a second round trip
+        market_cap = None
+        
+        # Validate price
+        if current_price <= 0:
+            self.negative_cache[symbol] = EMPTY_RESULT_TTL
+            raise StockDataException(f"Invalid price for {symbol}: {current_price}")
+        
+        stock_info = StockInfo(
+            symbol=symbol,
+            current_price=round(current_price, 2),
+            market_cap=market_cap,
+            volume=volume,
+            change_percent=round(change_percent, 2)
+        )
+        
+        # Cache the result for faster future requests (clearing any short-lived empty-result entry)
+        self.cache[symbol] = stock_info
+        self.negative_cache.pop(symbol, None)
+        await self._redis_set(stock_info)
+        
+        logger.info(f"⚡ Fast data fetched for {symbol}: ${current_price:.2f} ({change_percent:+.2f}%)")
+        return stock_info
+
     async def get_multiple_stocks(self, symbols: List[str]) -> List[StockInfo]:
-        """Get information for multiple stocks with proper rate limiting"""
+        """Get information for multiple stocks using batched spark requests"""
         if not symbols:
             return []
         
         logger.info(f"Fetching data for {len(symbols)} symbols: {symbols}")
-        stocks = []
         
-        for i, symbol in enumerate(symbols):
+        valid_symbols = []
+        for symbol in symbols:
             try:
-                # Add delay between requests to respect rate limits
-                if i > 0:
-                    await asyncio.sleep(2)
-                
-                stock_info = await self.get_stock_info(symbol)
-                if stock_info:
-                    stocks.append(stock_info)
-                else:
-                    logger.warning(f"Skipping {symbol} - no valid data available")
-                    
-            except Exception as e:
-                logger.error(f"Error processing symbol {symbol}: {e}")
-                continue
+                valid_symbols.append(_validate_symbol(symbol))
+            except StockDataException as e:
+                logger.error(f"Symbol validation failed: {e}")
+        
+        # Cached symbols never touch Yahoo
+        found: Dict[str, StockInfo] = {}
+        uncached_symbols = []
+        for symbol in dict.fromkeys(valid_symbols):
+            cached = self._cache_get(symbol, include_batch=True)
+            if cached is not None:
+                found[symbol] = cached
+            elif symbol not in self.negative_cache:
+                uncached_symbols.append(symbol)
+        
+        if uncached_symbols:
+            found.update(await self._redis_get_many(uncached_symbols))
+            uncached_symbols = [symbol for symbol in uncached_symbols if symbol not in found]
+        
+        if uncached_symbols:
+            found.update(await self._fetch_spark(uncached_symbols))
+            
+            # Fall back to the single-ticker path for anything the batch couldn't parse
+            missing = [symbol for symbol in uncached_symbols if symbol not in found]
+            if missing:
+                logger.info(f"Falling back to single-ticker fetch for {missing}")
+                found.update(await self._fetch_many(missing))
+        
+        stocks = []
+        for symbol in valid_symbols:
+            if symbol in found:
+                stocks.append(self._with_meta(symbol, found[symbol]))
+            else:
+                logger.warning(f"Skipping {symbol} - no valid data available")
         
         logger.info(f"Successfully fetched data for {len(stocks)}/{len(symbols)} symbols")
         return stocks
@@ -139,8 +581,9 @@ class StockService:
         # Check cache first for all symbols
         uncached_symbols = []
         for symbol in symbols:
-            if self._is_cache_valid(symbol):
-                results[symbol] = self.cache[symbol]['data']
+            cached = self._cache_get(symbol)
+            if cached is not None:
+                results[symbol] = self._with_meta(symbol, cached)
                 logger.info(f"⚡ Cache hit for {symbol}")
             else:
                 uncached_symbols.append(symbol)
@@ -152,41 +595,54 @@ class StockService:
         # Fetch uncached symbols concurrently
         logger.info(f"⚡ Fast batch fetch for {len(uncached_symbols)} symbols")
         
-        async def fetch_single(symbol):
-            try:
-                return symbol, await self.get_stock_info(symbol)
-            except Exception as e:
-                logger.warning(f"Failed to fetch {symbol}: {e}")
-                return symbol, None
-        
-        # Use asyncio.gather for concurrent fetching
-        import asyncio
-        fetch_tasks = [fetch_single(symbol) for symbol in uncached_symbols]
-        fetch_results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-        
-        # Collect results
-        for result in fetch_results:
-            if isinstance(result, tuple) and len(result) == 2:
-                symbol, stock_info = result
-                if stock_info:
-                    results[symbol] = stock_info
+        results.update(await self._fetch_many(uncached_symbols))
         
         logger.info(f"⚡ Batch fetch complete: {len(results)}/{len(symbols)} symbols")
         return results
 
-    def clear_cache(self):
-        """Clear the entire cache"""
+    async def invalidate(self, symbol: str):
+        """Drop everything cached for a symbol, including the shared Redis copy, so the next request refetches it"""
+        symbol = symbol.strip().upper()
+        self.cache.pop(symbol, None)
+        self.batch_cache.pop(symbol, None)
+        self.negative_cache.pop(symbol, None)
+        self.meta_cache.pop(symbol, None)
+        redis = _get_redis()
+        if redis:
+            try:
+                await redis.delete(f"stock:{symbol}")
+            except Exception as e:
+                logger.warning(f"⚠️ Redis delete failed for {symbol}: {e}")
+        logger.info(f"Cache invalidated for {symbol}")
+
+    async def clear_cache(self):
+        """Clear the entire cache, including shared quotes in Redis"""
         self.cache.clear()
+        self.batch_cache.clear()
+        self.negative_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        redis = _get_redis()
+        if redis:
+            try:
+                keys = [key async for key in redis.scan_iter(match="stock:*")]
+                if keys:
+                    await redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"⚠️ Redis clear failed: {e}")
         logger.info("Stock data cache cleared")
 
     def get_cache_status(self) -> Dict:
         """Get cache statistics"""
-        current_time = time.time()
-        valid_entries = sum(1 for entry in self.cache.values() 
-                           if current_time - entry['timestamp'] < self.cache_duration)
-        
+        self.cache.expire()
+        self.negative_cache.expire()
         return {
             'total_entries': len(self.cache),
-            'valid_entries': valid_entries,
-            'cache_duration_seconds': self.cache_duration
+            'valid_entries': len(self.cache),
+            'max_entries': self.cache.maxsize,
+            'negative_entries': len(self.negative_cache),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'cache_duration_seconds': self.cache_duration,
+            'shared_cache': 'redis' if REDIS_ENABLED else None
         }
@@ -4,19 +4,32 @@ Provides real-time updates for portfolio, trades, and AI decisions
 """
 
 import asyncio
-import json
+import orjson
 import logging
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+from collections import defaultdict
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
+import time
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Naive datetimes in payloads are serialized as UTC
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC
+
+# Broadcasts within this window share one formatted timestamp
+_TIMESTAMP_REFRESH_SECONDS = 0.05
+
+# Market data ticks are coalesced into one price_batch frame per window
+_MARKET_DATA_FLUSH_SECONDS = 0.1
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_topics: Dict[str, Set[str]] = {}  # connection_id -> topics
+        self.topic_subscribers: Dict[str, Set[str]] = defaultdict(set)  # topic -> connection_ids
+        self._ts_cache = (0.0, "")
         
     async def connect(self, websocket: WebSocket, connection_id: str = None) -> str:
         """Connect a new WebSocket client"""
@@ -24,6 +37,8 @@ class ConnectionManager:
             connection_id = str(uuid.uuid4())
         
         await websocket.accept()
+        # A reconnect under the same id starts with no subscriptions
+        self._remove_subscriptions(connection_id, self.connection_topics.get(connection_id, ()))
         self.active_connections[connection_id] = websocket
         self.connection_topics[connection_id] = set()
         
@@ -35,20 +50,32 @@ class ConnectionManager:
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
         if connection_id in self.connection_topics:
-            del self.connection_topics[connection_id]
+            self._remove_subscriptions(connection_id, self.connection_topics.pop(connection_id))
         
         logger.info(f"WebSocket client disconnected: {connection_id}")
     
+    def _remove_subscriptions(self, connection_id: str, topics):
+        """Remove a connection from the reverse topic index"""
+        for topic in topics:
+            subscribers = self.topic_subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection_id)
+                if not subscribers:
+                    del self.topic_subscribers[topic]
+    
     async def subscribe(self, connection_id: str, topics: List[str]):
         """Subscribe a connection to specific topics"""
         if connection_id in self.connection_topics:
             self.connection_topics[connection_id].update(topics)
+            for topic in topics:
+                self.topic_subscribers[topic].add(connection_id)
             logger.info(f"Client {connection_id} subscribed to: {topics}")
     
     async def unsubscribe(self, connection_id: str, topics: List[str]):
         """Unsubscribe a connection from specific topics"""
         if connection_id in self.connection_topics:
             self.connection_topics[connection_id] -= set(topics)
+            self._remove_subscriptions(connection_id, topics)
             logger.info(f"Client {connection_id} unsubscribed from: {topics}")
     
     async def send_personal_message(self, message: str, connection_id: str):
@@ -60,51 +87,49 @@ class ConnectionManager:
                 logger.error(f"Error sending message to {connection_id}: {e}")
                 self.disconnect(connection_id)
     
+    def _timestamp(self) -> str:
+        """ISO timestamp for broadcast envelopes, re-formatted at most every 50ms"""
+        now = time.time()
+        if now - self._ts_cache[0] > _TIMESTAMP_REFRESH_SECONDS:
+            self._ts_cache = (now, datetime.fromtimestamp(now).isoformat())
+        return self._ts_cache[1]
+    
+    async def _send_to_many(self, connection_ids: List[str], message_text: str):
+        """Send one message to several connections concurrently, dropping any that fail"""
+        targets = [cid for cid in connection_ids if cid in self.active_connections]
+        results = await asyncio.gather(
+            *(self.active_connections[cid].send_text(message_text) for cid in targets),
+            return_exceptions=True
+        )
+        
+        # Clean up disconnected clients
+        for connection_id, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error broadcasting to {connection_id}: {result}")
+                self.disconnect(connection_id)
+    
     async def broadcast_to_topic(self, topic: str, message: Dict):
         """Broadcast a message to all connections subscribed to a topic"""
         message_data = {
             "topic": topic,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._timestamp(),
             "data": message
         }
         
-        message_text = json.dumps(message_data)
-        disconnected_clients = []
-        
-        for connection_id, topics in self.connection_topics.items():
-            if topic in topics:
-                try:
-                    websocket = self.active_connections[connection_id]
-                    await websocket.send_text(message_text)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {connection_id}: {e}")
-                    disconnected_clients.append(connection_id)
-        
-        # Clean up disconnected clients
-        for connection_id in disconnected_clients:
-            self.disconnect(connection_id)
+        # Serialized once per broadcast; text frames keep JSON.parse(event.data) clients working
+        message_text = orjson.dumps(message_data, option=_ORJSON_OPTIONS).decode()
+        await self._send_to_many(list(self.topic_subscribers.get(topic, ())), message_text)
     
     async def broadcast_to_all(self, message: Dict):
         """Broadcast a message to all active connections"""
         message_data = {
             "topic": "broadcast",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._timestamp(),
             "data": message
         }
         
-        message_text = json.dumps(message_data)
-        disconnected_clients = []
-        
-        for connection_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_text(message_text)
-            except Exception as e:
-                logger.error(f"Error broadcasting to {connection_id}: {e}")
-                disconnected_clients.append(connection_id)
-        
-        # Clean up disconnected clients
-        for connection_id in disconnected_clients:
-            self.disconnect(connection_id)
+        message_text = orjson.dumps(message_data, option=_ORJSON_OPTIONS).decode()
+        await self._send_to_many(list(self.active_connections), message_text)
     
     def get_connection_count(self) -> int:
         """Get the number of active connections"""
@@ -112,11 +137,7 @@ class ConnectionManager:
     
     def get_topic_subscribers(self, topic: str) -> int:
         """Get the number of subscribers for a topic"""
-        count = 0
-        for topics in self.connection_topics.values():
-            if topic in topics:
-                count += 1
-        return count
+        return len(self.topic_subscribers.get(topic, ()))
 
 # Global connection manager
 manager = ConnectionManager()
@@ -126,6 +147,8 @@ class TradingWebSocketManager:
     
     def __init__(self, connection_manager: ConnectionManager):
         self.manager = connection_manager
+        self._tick_buffer: Dict[str, Dict] = {}  # symbol -> latest market data
+        self._flush_task: Optional[asyncio.Task] = None
     
     async def notify_ai_decision(self, decision_data: Dict):
         """Notify clients about new AI trading decisions"""
@@ -156,12 +179,23 @@ class TradingWebSocketManager:
         })
     
     async def notify_market_data(self, symbol: str, market_data: Dict):
-        """Notify clients about market data updates"""
-        await self.manager.broadcast_to_topic("market_data", {
-            "type": "price_update",
-            "symbol": symbol,
-            "data": market_data
-        })
+        """Queue a market data update; ticks are flushed as one price_batch frame every 100ms"""
+        self._tick_buffer[symbol] = market_data
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_market_data())
+    
+    async def _flush_market_data(self):
+        """Broadcast buffered ticks until the buffer stays empty for a full window"""
+        while self._tick_buffer:
+            await asyncio.sleep(_MARKET_DATA_FLUSH_SECONDS)
+            snapshot, self._tick_buffer = self._tick_buffer, {}
+            try:
+                await self.manager.broadcast_to_topic("market_data", {
+                    "type": "price_batch",
+                    "updates": snapshot
+                })
+            except Exception as e:
+                logger.error(f"Error flushing market data: {e}")
     
     async def notify_news_analysis(self, news_data: Dict):
         """Notify clients about new news analysis"""
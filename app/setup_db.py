@@ -4,10 +4,8 @@
 Database setup script for AI Trading Agent
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from database import create_tables, SessionLocal, Portfolio
 from config import settings
 
@@ -22,18 +20,19 @@ def setup_database():
     # Create default portfolio if it doesn't exist
     db = SessionLocal()
     try:
-        portfolio = db.query(Portfolio).filter(Portfolio.id == 1).first()
-        if not portfolio:
-            portfolio = Portfolio(
-                id=1,
-                cash_balance=settings.INITIAL_BUDGET,
-                total_value=settings.INITIAL_BUDGET
-            )
-            db.add(portfolio)
-            db.commit()
+        # Single INSERT ... ON CONFLICT DO NOTHING instead of SELECT-then-INSERT
+        insert = sqlite_insert if db.bind.dialect.name == "sqlite" else postgresql_insert
+        stmt = insert(Portfolio).values(
+            id=1,
+            cash_balance=settings.INITIAL_BUDGET,
+            total_value=settings.INITIAL_BUDGET
+        ).on_conflict_do_nothing(index_elements=["id"])
+        result = db.execute(stmt)
+        db.commit()
+        if result.rowcount:
             print(f"✅ Default portfolio created with ${settings.INITIAL_BUDGET:,.2f}")
         else:
-            print(f"✅ Portfolio already exists with ${portfolio.cash_balance:,.2f}")
+            print("✅ Portfolio already exists")
     finally:
         db.close()
     
@@ -4,59 +4,455 @@ Using the websockets library version 14+ compatible handler
 """
 
 import asyncio
-import json
+import heapq
+import httpx
+import itertools
+import orjson
 import logging
+import msgspec
+import multiprocessing
+import socket
+import time
 import websockets
+from array import array
+from collections import deque
 from datetime import datetime
-from typing import Dict, Set
-import uuid
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Dict, List, Optional, Tuple, Union
+from websockets.frames import Opcode
+from websockets.protocol import State
+from websockets.server import ServerProtocol
+
+from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Frames are built as UTF-8 bytes and sent with text=True, so they go out as text
+# frames without a str round-trip
+
+# Pong frames only differ by timestamp, so the JSON around it is prebuilt
+_PONG_PREFIX = b'{"type":"pong","timestamp":"'
+_PONG_SUFFIX = b'"}'
+
+# Welcome frames are built around the connection id without a dict round-trip
+_WELCOME_PREFIX = b'{"type":"welcome","connection_id":"c'
+_WELCOME_TIMESTAMP = b'","timestamp":"'
+_WELCOME_SUFFIX = b'"}'
+
+# Connection ids are plain increasing ints; they're only stringified on the wire
+_id_counter = itertools.count(1)
+
+# Frame timestamps are re-formatted at most once per millisecond
+_TIMESTAMP_REFRESH_SECONDS = 0.001
+_ts_cache = (0.0, "", b"")
+
+def _refresh_timestamp():
+    global _ts_cache
+    now = time.time()
+    if now - _ts_cache[0] > _TIMESTAMP_REFRESH_SECONDS:
+        iso = datetime.fromtimestamp(now).isoformat()
+        _ts_cache = (now, iso, iso.encode())
+
+def _now_iso() -> str:
+    """Cached ISO timestamp for outgoing frames"""
+    _refresh_timestamp()
+    return _ts_cache[1]
+
+def _now_iso_bytes() -> bytes:
+    """Cached ISO timestamp, already encoded for prebuilt byte frames"""
+    _refresh_timestamp()
+    return _ts_cache[2]
+
+# Per-connection send queue bound; when full the oldest queued update is dropped
+SEND_QUEUE_MAXSIZE = 256
+
+# Address every worker binds (SO_REUSEPORT lets several share it)
+SERVER_HOST = "localhost"
+SERVER_PORT = 8002
+
+# Per-connection limits for websockets.serve
+SERVER_MAX_SIZE = 65536
+SERVER_MAX_QUEUE = 8
+SERVER_WRITE_LIMIT = 8192
+
+# The sans-I/O backend reads in small chunks and skips the asyncio wrapper's per-connection queues
+SANSIO_READ_SIZE = 8192
+
+# Frames larger than this are decoded in a worker thread to keep the loop responsive
+LARGE_FRAME_BYTES = 8192
+LARGE_BATCH_ITEMS = 64
+
+# Number of dicts the client_id -> slot map is striped across (power of two)
+SLOT_SHARDS = 16
+
+# Shared downstream pools: HTTP connections and concurrent DB operations
+HTTP_MAX_CONNECTIONS = 100
+DB_MAX_CONCURRENCY = 20
+
+# Messages a topic may fan out per broadcast rotation unless overridden
+DEFAULT_TOPIC_WEIGHT = 8
+
+# Topics the server publishes (same set as services/websocket_manager.py). Each maps to a
+# fixed bit so a connection's subscriptions fit in one uint64; unknown topics are rejected.
+SERVER_TOPICS = (
+    "market_data",
+    "trades",
+    "portfolio",
+    "ai_decisions",
+    "engine_status",
+    "news",
+    "errors",
+    "analytics",
+)
+TOPIC_ID: Dict[str, int] = {topic: bit for bit, topic in enumerate(SERVER_TOPICS)}
+
+def _topic_mask(topics) -> Tuple[int, List[str]]:
+    """Build the subscription bitmap for a list of topic names, returning it with the topics accepted"""
+    mask = 0
+    accepted = []
+    for topic in topics:
+        bit = TOPIC_ID.get(topic)
+        if bit is None:
+            continue
+        mask |= 1 << bit
+        accepted.append(topic)
+    return mask, accepted
+
 class WebSocketManager:
     def __init__(self):
-        self.connections: Dict[str, any] = {}
-        self.subscriptions: Dict[str, Set[str]] = {}
+        # Per-connection state lives in parallel arrays indexed by slot
+        self.ws_array: List[Optional[any]] = []
+        self.sub_bitmap = array('Q')
+        self.queue_array: List[Optional[asyncio.Queue]] = []
+        self.writer_array: List[Optional[asyncio.Task]] = []
+        # Messages discarded because a client's send queue was full
+        self.slow_consumer_drops = 0
+        # Min-heap of free slots: reusing the lowest first keeps live connections packed at the front
+        self.free_slots: List[int] = []
+        # client_id -> slot, striped so each dict (and each resize) stays small
+        self.slot_shards: List[Dict[int, int]] = [{} for _ in range(SLOT_SHARDS)]
         
-    async def register(self, websocket) -> str:
+        # Topic broadcasts are fair-queued so one noisy topic can't starve the rest
+        self.topic_queues: Dict[str, deque] = {}
+        self.topic_weights: Dict[str, int] = {}
+        self.topic_age: Dict[str, int] = {}
+        self._broadcast_ready = asyncio.Event()
+        self._broadcast_task: Optional[asyncio.Task] = None
+        
+        # Downstream calls made while handling messages share these pools instead of
+        # opening clients/sessions per connection
+        self.http: Optional[httpx.AsyncClient] = None
+        self._db_slots = asyncio.Semaphore(DB_MAX_CONCURRENCY)
+    
+    def _shard(self, connection_id: int) -> Dict[int, int]:
+        return self.slot_shards[connection_id & (SLOT_SHARDS - 1)]
+    
+    async def start(self):
+        """Create the shared downstream HTTP client"""
+        if self.http is None:
+            self.http = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS)
+            )
+    
+    async def close(self):
+        """Release the shared downstream HTTP client"""
+        if self.http is not None:
+            await self.http.aclose()
+            self.http = None
+    
+    async def run_db(self, fn, *args):
+        """Run fn(db, *args) with a pooled SQLAlchemy session in a worker thread"""
+        # Imported here so the server doesn't create a DB engine until a handler needs one
+        from database import SessionLocal
+        
+        def call():
+            db = SessionLocal()
+            try:
+                return fn(db, *args)
+            finally:
+                db.close()
+        
+        async with self._db_slots:
+            return await asyncio.to_thread(call)
+        
+    async def register(self, websocket) -> int:
         """Register a new WebSocket connection"""
-        connection_id = f"client_{int(datetime.now().timestamp() * 1000)}_{uuid.uuid4().hex[:8]}"
-        self.connections[connection_id] = websocket
-        self.subscriptions[connection_id] = set()
-        logger.info(f"✅ WebSocket client connected: {connection_id}")
+        connection_id = next(_id_counter)
+        queue = asyncio.Queue(maxsize=SEND_QUEUE_MAXSIZE)
+        writer = asyncio.create_task(self._writer(connection_id, websocket, queue))
+        slot = self._take_free_slot()
+        if slot is not None:
+            self.ws_array[slot] = websocket
+            self.sub_bitmap[slot] = 0
+            self.queue_array[slot] = queue
+            self.writer_array[slot] = writer
+        else:
+            slot = len(self.ws_array)
+            self.ws_array.append(websocket)
+            self.sub_bitmap.append(0)
+            self.queue_array.append(queue)
+            self.writer_array.append(writer)
+        self._shard(connection_id)[connection_id] = slot
+        logger.debug("✅ WebSocket client connected: %s", connection_id)
         return connection_id
     
-    async def unregister(self, connection_id: str):
+    async def unregister(self, connection_id: int):
         """Unregister a WebSocket connection"""
-        if connection_id in self.connections:
-            del self.connections[connection_id]
-        if connection_id in self.subscriptions:
-            del self.subscriptions[connection_id]
-        logger.info(f"🔌 WebSocket client disconnected: {connection_id}")
-    
-    async def subscribe(self, connection_id: str, topics: list):
-        """Subscribe a connection to topics"""
-        if connection_id in self.subscriptions:
-            self.subscriptions[connection_id].update(topics)
-            logger.info(f"Client {connection_id} subscribed to: {topics}")
-    
-    async def send_to_connection(self, connection_id: str, message: dict):
-        """Send message to a specific connection"""
-        if connection_id in self.connections:
+        slot = self._shard(connection_id).pop(connection_id, None)
+        if slot is not None:
+            self.writer_array[slot].cancel()
+            self.ws_array[slot] = None
+            self.sub_bitmap[slot] = 0
+            self.queue_array[slot] = None
+            self.writer_array[slot] = None
+            heapq.heappush(self.free_slots, slot)
+            self._trim_free_tail()
+        logger.debug("🔌 WebSocket client disconnected: %s", connection_id)
+    
+    def _take_free_slot(self) -> Optional[int]:
+        """Pop the lowest free slot, skipping entries already trimmed off the arrays"""
+        while self.free_slots:
+            slot = heapq.heappop(self.free_slots)
+            if slot < len(self.ws_array):
+                return slot
+        return None
+    
+    def _trim_free_tail(self):
+        """Shrink the arrays while their last slot is free so broadcast scans stay short"""
+        while self.ws_array and self.ws_array[-1] is None:
+            self.ws_array.pop()
+            self.sub_bitmap.pop()
+            self.queue_array.pop()
+            self.writer_array.pop()
+    
+    async def subscribe(self, connection_id: int, topics: list) -> List[str]:
+        """Subscribe a connection to known topics, returning the ones actually applied"""
+        slot = self._shard(connection_id).get(connection_id)
+        if slot is None:
+            return []
+        mask, accepted = _topic_mask(topics)
+        self.sub_bitmap[slot] |= mask
+        logger.debug("Client %s subscribed to: %s", connection_id, accepted)
+        return accepted
+    
+    async def send_to_connection(self, connection_id: int, message: dict):
+        """Queue a message for a specific connection"""
+        slot = self._shard(connection_id).get(connection_id)
+        if slot is None:
+            return False
+        self._enqueue(self.queue_array[slot], message)
+        return True
+    
+    def _enqueue(self, queue: asyncio.Queue, message: dict):
+        """Queue a message for a writer, dropping the oldest one if the client is falling behind"""
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.put_nowait(message)
+            self.slow_consumer_drops += 1
+    
+    def set_topic_weight(self, topic: str, weight: int):
+        """Set how many messages a topic may send per scheduler rotation"""
+        self.topic_weights[topic] = max(1, weight)
+    
+    async def broadcast_to_topic(self, topic: str, message: dict):
+        """Queue a message for every connection subscribed to a topic"""
+        if topic not in TOPIC_ID:
+            return
+        queue = self.topic_queues.get(topic)
+        if queue is None:
+            queue = self.topic_queues[topic] = deque()
+        queue.append(message)
+        self._broadcast_ready.set()
+        if self._broadcast_task is None or self._broadcast_task.done():
+            self._broadcast_task = asyncio.create_task(self._broadcast_loop())
+    
+    def _fan_out(self, topic: str, message: dict):
+        """Hand a message to the writer queue of every subscriber of a topic"""
+        mask = 1 << TOPIC_ID[topic]
+        queues = self.queue_array
+        for slot, bits in enumerate(self.sub_bitmap):
+            if bits & mask:
+                self._enqueue(queues[slot], message)
+    
+    async def _broadcast_loop(self):
+        """Round-robin over topic queues, sending up to each topic's weight per turn.
+
+        A topic that still has a backlog after its turn ages by one, raising
+        its budget on the next rotation (capped at twice its weight), so
+        low-rate topics keep bounded latency next to a busy one.
+        """
+        while True:
+            await self._broadcast_ready.wait()
+            self._broadcast_ready.clear()
+            
+            while any(self.topic_queues.values()):
+                for topic, queue in list(self.topic_queues.items()):
+                    if not queue:
+                        continue
+                    weight = self.topic_weights.get(topic, DEFAULT_TOPIC_WEIGHT)
+                    budget = weight + self.topic_age.get(topic, 0)
+                    while queue and budget:
+                        self._fan_out(topic, queue.popleft())
+                        budget -= 1
+                    if queue:
+                        self.topic_age[topic] = min(self.topic_age.get(topic, 0) + 1, weight)
+                    else:
+                        self.topic_age.pop(topic, None)
+                # Let writers and readers run between rotations
+                await asyncio.sleep(0)
+    
+    async def _writer(self, connection_id: int, websocket, queue: asyncio.Queue):
+        """Drain queued messages for a connection, coalescing bursts into one frame"""
+        while True:
+            batch = [await queue.get()]
+            while True:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            if len(batch) == 1:
+                payload = batch[0]
+            else:
+                payload = {"type": "batch", "items": batch}
+            
             try:
-                await self.connections[connection_id].send(json.dumps(message))
-                return True
+                if len(batch) > LARGE_BATCH_ITEMS:
+                    frame = await asyncio.to_thread(orjson.dumps, payload)
+                else:
+                    frame = orjson.dumps(payload)
+                await websocket.send(frame, text=True)
             except websockets.exceptions.ConnectionClosed:
-                await self.unregister(connection_id)
-                return False
+                return
             except Exception as e:
                 logger.error(f"Error sending message to {connection_id}: {e}")
+
+class SansIOConnection:
+    """Connection driving websockets' ServerProtocol directly over asyncio streams.
+
+    Exposes the same send()/async-iteration surface handle_client uses on
+    websockets' own connections.
+    """
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.protocol = ServerProtocol(max_size=SERVER_MAX_SIZE)
+        self.remote_address = writer.get_extra_info("peername")
+    
+    async def _flush(self):
+        """Write out whatever the protocol has queued (frames, pongs, close replies)"""
+        for data in self.protocol.data_to_send():
+            if data:
+                self.writer.write(data)
+            elif self.writer.can_write_eof():
+                self.writer.write_eof()
+        await self.writer.drain()
+    
+    async def _receive(self) -> bool:
+        """Feed the next chunk from the socket to the protocol; False on EOF"""
+        data = await self.reader.read(SANSIO_READ_SIZE)
+        if data:
+            self.protocol.receive_data(data)
+        else:
+            self.protocol.receive_eof()
+        return bool(data)
+    
+    async def handshake(self) -> bool:
+        """Complete the opening handshake; False if the client didn't upgrade"""
+        while True:
+            more = await self._receive()
+            for request in self.protocol.events_received():
+                self.protocol.send_response(self.protocol.accept(request))
+                await self._flush()
+                return self.protocol.handshake_exc is None
+            if not more:
                 return False
-        return False
+    
+    async def send(self, message, text: Optional[bool] = None):
+        state = self.protocol.state
+        if state is State.CLOSED:
+            raise self.protocol.close_exc
+        if state is not State.OPEN:
+            # CLOSING: close_exc is only valid once CLOSED, so report the close frames we have
+            raise websockets.exceptions.ConnectionClosed(self.protocol.close_rcvd, self.protocol.close_sent)
+        if isinstance(message, str):
+            message = message.encode()
+        if text is False:
+            self.protocol.send_binary(message)
+        else:
+            self.protocol.send_text(message)
+        await self._flush()
+    
+    async def __aiter__(self):
+        fragments = []
+        while True:
+            more = await self._receive()
+            for frame in self.protocol.events_received():
+                if frame.opcode in (Opcode.TEXT, Opcode.BINARY, Opcode.CONT):
+                    fragments.append(frame.data)
+                    if frame.fin:
+                        message = b"".join(fragments)
+                        fragments.clear()
+                        yield message
+            await self._flush()
+            if not more or self.protocol.state is State.CLOSED:
+                return
+
+async def _handle_sansio_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """asyncio.start_server callback for the sans-I/O backend"""
+    connection = SansIOConnection(reader, writer)
+    try:
+        if await connection.handshake():
+            await handle_client(connection)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
 
 # Global manager instance
 ws_manager = WebSocketManager()
 
+# Pings are matched on the raw frame so they never go through the JSON decoder
+_PING_HEAD = '{"type":"ping"'
+_PING_HEAD_BYTES = _PING_HEAD.encode()
+
+async def _send_pong(websocket):
+    await websocket.send(_PONG_PREFIX + _now_iso_bytes() + _PONG_SUFFIX, text=True)
+
+class SubscribeMessage(msgspec.Struct, tag="subscribe"):
+    topics: List[str] = msgspec.field(default_factory=list)
+
+class PingMessage(msgspec.Struct, tag="ping"):
+    pass
+
+# Parsing, validation and dispatch on the "type" tag happen in one C-level pass
+_message_decoder = msgspec.json.Decoder(Union[SubscribeMessage, PingMessage])
+
+async def _handle_subscribe(websocket, connection_id: int, message: SubscribeMessage):
+    accepted = await ws_manager.subscribe(connection_id, message.topics)
+    confirmation = {
+        "type": "subscription_confirmed",
+        "topics": accepted,
+        "timestamp": _now_iso()
+    }
+    rejected = [topic for topic in message.topics if topic not in TOPIC_ID]
+    if rejected:
+        confirmation["rejected"] = rejected
+    await websocket.send(orjson.dumps(confirmation), text=True)
+
+async def _handle_ping(websocket, connection_id: int, message: PingMessage):
+    await _send_pong(websocket)
+
+MESSAGE_HANDLERS = {
+    SubscribeMessage: _handle_subscribe,
+    PingMessage: _handle_ping,
+}
+
 async def handle_client(websocket):
     """Handle a WebSocket client connection - compatible with websockets 14+"""
     connection_id = None
@@ -65,44 +461,48 @@ async def handle_client(websocket):
         connection_id = await ws_manager.register(websocket)
         
         # Send welcome message
-        await websocket.send(json.dumps({
-            "type": "welcome",
-            "connection_id": connection_id,
-            "timestamp": datetime.now().isoformat()
-        }))
+        await websocket.send(
+            _WELCOME_PREFIX + str(connection_id).encode() + _WELCOME_TIMESTAMP + _now_iso_bytes() + _WELCOME_SUFFIX,
+            text=True
+        )
         
         # Keep the connection alive and handle incoming messages
+        message_count = 0
         async for message in websocket:
+            # Yield every 32 messages so a bursty client can't starve the others
+            message_count += 1
+            if message_count & 0x1F == 0:
+                await asyncio.sleep(0)
+            
             try:
-                data = json.loads(message)
-                logger.info(f"Received message from {connection_id}: {data}")
+                head = message[:14]
+                if head == _PING_HEAD or head == _PING_HEAD_BYTES:
+                    await _send_pong(websocket)
+                    continue
                 
-                if data.get("type") == "subscribe":
-                    topics = data.get("topics", [])
-                    await ws_manager.subscribe(connection_id, topics)
-                    await websocket.send(json.dumps({
-                        "type": "subscription_confirmed",
-                        "topics": topics,
-                        "timestamp": datetime.now().isoformat()
-                    }))
+                if len(message) > LARGE_FRAME_BYTES:
+                    decoded = await asyncio.to_thread(_message_decoder.decode, message)
+                else:
+                    decoded = _message_decoder.decode(message)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received message from %s: %s", connection_id, decoded)
                 
-                elif data.get("type") == "ping":
-                    await websocket.send(json.dumps({
-                        "type": "pong",
-                        "timestamp": datetime.now().isoformat()
-                    }))
+                await MESSAGE_HANDLERS[type(decoded)](websocket, connection_id, decoded)
                 
-            except json.JSONDecodeError:
-                await websocket.send(json.dumps({
+            except msgspec.ValidationError as e:
+                # Well-formed JSON we don't handle (unknown type, bad fields) is ignored as before
+                logger.debug("Ignoring message from %s: %s", connection_id, e)
+            except msgspec.DecodeError:
+                await websocket.send(orjson.dumps({
                     "type": "error",
                     "message": "Invalid JSON format",
-                    "timestamp": datetime.now().isoformat()
-                }))
+                    "timestamp": _now_iso()
+                }), text=True)
             except Exception as e:
                 logger.error(f"Error handling message from {connection_id}: {e}")
                 
     except websockets.exceptions.ConnectionClosed:
-        logger.info(f"Connection closed normally for {connection_id}")
+        logger.debug("Connection closed normally for %s", connection_id)
     except Exception as e:
         logger.error(f"Error in WebSocket handler: {e}")
     finally:
@@ -111,15 +511,106 @@ async def handle_client(websocket):
 
 async def start_websocket_server():
     """Start the WebSocket server"""
-    logger.info("🚀 Starting WebSocket server on localhost:8002")
+    logger.info(f"🚀 Starting WebSocket server on {SERVER_HOST}:{SERVER_PORT}")
     
-    # Use the proper server creation for websockets 14+
-    server = await websockets.serve(handle_client, "localhost", 8002)
-    logger.info("✅ WebSocket server running on ws://localhost:8002")
+    await ws_manager.start()
+    try:
+        await _serve()
+    finally:
+        await ws_manager.close()
+
+def _listen_socket() -> socket.socket:
+    """Bind the server port; with more than one worker, SO_REUSEPORT lets the processes share it"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # Only when sharing is intended - otherwise a second server started by mistake would
+    # silently split connections with this one instead of failing to bind
+    if settings.WEBSOCKET_WORKERS > 1 and hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((SERVER_HOST, SERVER_PORT))
+    sock.listen(socket.SOMAXCONN)
+    sock.setblocking(False)
+    return sock
+
+async def _serve():
+    """Run the configured server backend until it shuts down"""
+    sock = _listen_socket()
+    
+    if settings.WEBSOCKET_BACKEND == "sansio":
+        server = await asyncio.start_server(_handle_sansio_client, sock=sock, limit=SANSIO_READ_SIZE)
+        logger.info(f"✅ WebSocket server (sans-I/O backend) running on ws://{SERVER_HOST}:{SERVER_PORT}")
+        async with server:
+            await server.serve_forever()
+        return
+    
+    # Use the proper server creation for websockets 14+. Frames are small JSON, so
+    # permessage-deflate (a zlib context per connection) costs more than it saves.
+    server = await websockets.serve(
+        handle_client,
+        sock=sock,
+        compression=None,
+        max_size=SERVER_MAX_SIZE,
+        max_queue=SERVER_MAX_QUEUE,
+        write_limit=SERVER_WRITE_LIMIT,
+        ping_interval=20,
+        ping_timeout=10
+    )
+    logger.info(f"✅ WebSocket server running on ws://{SERVER_HOST}:{SERVER_PORT}")
     
     # Keep the server running
     await server.wait_closed()
 
+def configure_logging(level=logging.INFO) -> QueueListener:
+    """Route log records through a queue so handlers never block the event loop"""
+    log_queue = SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+def run_server():
+    """Serve in this process until interrupted"""
+    log_listener = configure_logging()
+    # uvloop is optional; fall back to the default asyncio loop without it
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    try:
+        asyncio.run(start_websocket_server())
+    except KeyboardInterrupt:
+        logger.info("Server stopped by user")
+    finally:
+        log_listener.stop()
+
+def main():
+    """Run one server, or WEBSOCKET_WORKERS processes sharing the port via SO_REUSEPORT.
+
+    Each worker has its own event loop and WebSocketManager, so broadcasts
+    only reach the clients connected to that worker.
+    """
+    workers = settings.WEBSOCKET_WORKERS
+    if workers <= 1 or not hasattr(socket, "SO_REUSEPORT"):
+        run_server()
+        return
+    
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=run_server, name=f"ws-worker-{i}") for i in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Workers get the same SIGINT and shut down on their own
+        for process in processes:
+            process.join()
+
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    asyncio.run(start_websocket_server())
+    main()
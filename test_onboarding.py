@@ -3,10 +3,15 @@
 Test script for onboarding functionality
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
 BASE_URL = "http://localhost:8001/api"
 
+# One keep-alive session for every call so the tests reuse the same TCP connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 def test_onboarding_chat():
     """Test the onboarding chat endpoint"""
     print("🧪 Testing onboarding chat...")
@@ -18,7 +23,7 @@ def test_onboarding_chat():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/onboarding/chat", json=payload, timeout=30)
+        response = SESSION.post(f"{BASE_URL}/onboarding/chat", json=payload, timeout=30)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Chat response: {data['response'][:100]}...")
@@ -36,7 +41,7 @@ def test_preferences_endpoint():
     print("🧪 Testing preferences endpoint...")
     
     try:
-        response = requests.get(f"{BASE_URL}/onboarding/preferences", timeout=10)
+        response = SESSION.get(f"{BASE_URL}/onboarding/preferences", timeout=10)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Preferences: {data}")
@@ -63,7 +68,7 @@ def test_save_preferences():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/onboarding/save-preferences", json=test_preferences, timeout=10)
+        response = SESSION.post(f"{BASE_URL}/onboarding/save-preferences", json=test_preferences, timeout=10)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Preferences saved: {data['message']}")